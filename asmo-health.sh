@@ -112,16 +112,16 @@ cmd_status() {
     print_header "System Status"
     
     # Check if history exists
-    if [ -f "data/health_history.json" ]; then
-        ENTRIES=$(cat data/health_history.json | python3 -c "import sys, json; print(len(json.load(sys.stdin)))")
+    if [ -f "data/health_history.jsonl" ]; then
+        ENTRIES=$(grep -c . data/health_history.jsonl || true)
         print_info "History entries: $ENTRIES"
         
         # Show latest timestamp
-        LATEST=$(cat data/health_history.json | python3 -c "import sys, json; data=json.load(sys.stdin); print(data[-1]['timestamp'] if data else 'N/A')")
+        LATEST=$(tail -n 1 data/health_history.jsonl | python3 -c "import sys, json; line=sys.stdin.read().strip(); print(json.loads(line)['timestamp'] if line else 'N/A')")
         print_info "Latest entry: $LATEST"
         
         # Check file size
-        SIZE=$(du -h data/health_history.json | cut -f1)
+        SIZE=$(du -h data/health_history.jsonl | cut -f1)
         print_info "History size: $SIZE"
     else
         print_warning "No history file found yet"
@@ -158,19 +158,21 @@ cmd_status() {
 cmd_history() {
     print_header "Recent History"
     
-    if [ ! -f "data/health_history.json" ]; then
+    if [ ! -f "data/health_history.jsonl" ]; then
         print_error "No history file found"
         exit 1
     fi
     
     if command -v jq &> /dev/null; then
-        cat data/health_history.json | jq '.[-5:] | .[] | {timestamp, cpu_percent, ram_percent, containers_running}'
+        tail -n 5 data/health_history.jsonl | jq '{timestamp, cpu_percent, ram_percent, containers_running}'
     else
         print_warning "jq not installed, showing raw JSON"
-        cat data/health_history.json | python3 -c "
+        tail -n 5 data/health_history.jsonl | python3 -c "
 import sys, json
-data = json.load(sys.stdin)
-for entry in data[-5:]:
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    entry = json.loads(line)
     print(f\"{entry['timestamp']}: CPU {entry.get('cpu_percent', 'N/A')}%, RAM {entry.get('ram_percent', 'N/A')}%\")
 "
     fi
@@ -210,7 +212,7 @@ cmd_clean() {
 cmd_backup() {
     print_header "Backup"
     
-    if [ ! -f "data/health_history.json" ]; then
+    if [ ! -f "data/health_history.jsonl" ]; then
         print_error "No history file to backup"
         exit 1
     fi
@@ -219,9 +221,9 @@ cmd_backup() {
     mkdir -p "$BACKUP_DIR"
     
     TIMESTAMP=$(date +%Y%m%d_%H%M%S)
-    BACKUP_FILE="$BACKUP_DIR/health_history_$TIMESTAMP.json"
+    BACKUP_FILE="$BACKUP_DIR/health_history_$TIMESTAMP.jsonl"
     
-    cp data/health_history.json "$BACKUP_FILE"
+    cp data/health_history.jsonl "$BACKUP_FILE"
     
     print_success "Backup created: $BACKUP_FILE"
     
@@ -8,17 +8,31 @@ Can also detect critical issues and trigger immediate alerts.
 
 import sys
 import json
+import functools
+import queue
+import atexit
 import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+# Default locations, relative to the repository root
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_DEFAULT_CONFIG = _REPO_ROOT / "config.json"
+_EXAMPLE_CONFIG = _REPO_ROOT / "config.example.json"
+_DEFAULT_HISTORY = _REPO_ROOT / "data" / "health_history.jsonl"
+_DEFAULT_LOG = _REPO_ROOT / "logs" / "asmo.log"
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(_REPO_ROOT))
 
 from utils.docker_client import DockerMonitor
 from utils.metrics import get_all_system_metrics, SystemMetrics
 from utils.storage import HealthStorage
+from utils.serialization import dumps
 
 
 def setup_logging(log_file: str, verbose: bool = False) -> logging.Logger:
@@ -28,36 +42,61 @@ def setup_logging(log_file: str, verbose: bool = False) -> logging.Logger:
     # Ensure log directory exists
     Path(log_file).parent.mkdir(parents=True, exist_ok=True)
     
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    
+    # File writes happen on a background listener thread; stdout stays
+    # synchronous so log lines never interleave with the JSON output
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Configure logging
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
+            queue_handler,
+            stream_handler
         ]
     )
     
     return logging.getLogger(__name__)
 
 
-def load_config(config_path: str = None) -> dict:
-    """Load configuration from JSON file"""
+def load_config(config_path: str = None) -> Mapping:
+    """
+    Load configuration from JSON file
+    
+    The result is cached per resolved path and shared between callers, so
+    it is returned as a read-only mapping and must not be mutated.
+    """
     if config_path is None:
-        config_path = Path(__file__).parent.parent / "config.json"
+        config_path = _DEFAULT_CONFIG
     
+    return _load_config_cached(str(Path(config_path).resolve()))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path: str) -> Mapping:
+    """Parse a configuration file (see load_config)"""
     try:
         with open(config_path, 'r') as f:
-            return json.load(f)
+            return MappingProxyType(json.load(f))
     except FileNotFoundError:
         print(f"⚠️  Config file not found: {config_path}")
         print("📝 Using default configuration. Run with --create-config to generate one.")
         
         # Return default config
-        return {
+        return MappingProxyType({
             "paths": {
-                "history_file": str(Path(__file__).parent.parent / "data" / "health_history.json"),
-                "log_file": str(Path(__file__).parent.parent / "logs" / "asmo.log")
+                "history_file": str(_DEFAULT_HISTORY),
+                "log_file": str(_DEFAULT_LOG)
             },
             "monitoring": {
                 "history_retention_days": 7,
@@ -73,21 +112,23 @@ def load_config(config_path: str = None) -> dict:
             },
             "docker": {
                 "socket": "unix:///var/run/docker.sock",
-                "containers_to_ignore": []
+                "containers_to_ignore": [],
+                "max_workers": 16
             },
             "alerts": {
                 "critical_immediate": True
             }
-        }
+        })
 
 
-def collect_metrics(config: dict, logger: logging.Logger) -> dict:
+def collect_metrics(config: dict, logger: logging.Logger, timestamp: str = None) -> dict:
     """
     Collect all metrics (system + Docker)
     
     Args:
         config: Configuration dictionary
         logger: Logger instance
+        timestamp: ISO timestamp of this cycle (defaults to now)
         
     Returns:
         Dictionary with all collected metrics
@@ -100,7 +141,7 @@ def collect_metrics(config: dict, logger: logging.Logger) -> dict:
     
     # Flatten system metrics for easier access
     metrics = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp or datetime.now().isoformat(),
         'cpu_percent': system_metrics['cpu']['cpu_percent'],
         'cpu_count': system_metrics['cpu']['cpu_count'],
         'ram_total_gb': system_metrics['memory']['ram_total_gb'],
@@ -116,18 +157,34 @@ def collect_metrics(config: dict, logger: logging.Logger) -> dict:
     # Collect Docker metrics
     logger.debug("Collecting Docker metrics...")
     try:
-        docker_client = DockerMonitor(config['docker']['socket'])
+        docker_client = DockerMonitor(
+            config['docker']['socket'],
+            max_workers=config['docker'].get('max_workers', 16)
+        )
         
         # Get container info
         containers = docker_client.get_all_containers(
             ignore_list=config['docker'].get('containers_to_ignore', [])
         )
         
+        # Count running/stopped/unhealthy containers in a single pass
+        running = stopped = unhealthy = max_restarts = 0
+        for c in containers:
+            if c['status'] == 'running':
+                running += 1
+            else:
+                stopped += 1
+            if c.get('health') == 'unhealthy':
+                unhealthy += 1
+            if c.get('restarts', 0) > max_restarts:
+                max_restarts = c['restarts']
+        
         metrics['containers'] = containers
         metrics['containers_total'] = len(containers)
-        metrics['containers_running'] = len([c for c in containers if c['status'] == 'running'])
-        metrics['containers_stopped'] = len([c for c in containers if c['status'] != 'running'])
-        metrics['containers_unhealthy'] = len([c for c in containers if c.get('health') == 'unhealthy'])
+        metrics['containers_running'] = running
+        metrics['containers_stopped'] = stopped
+        metrics['containers_unhealthy'] = unhealthy
+        metrics['containers_max_restarts'] = max_restarts
         
         # Get Docker system info
         docker_info = docker_client.get_docker_info()
@@ -136,11 +193,14 @@ def collect_metrics(config: dict, logger: logging.Logger) -> dict:
         docker_client.close()
         
     except Exception as e:
-        logger.error(f"❌ Error collecting Docker metrics: {e}")
+        logger.error("❌ Error collecting Docker metrics: %s", e)
         metrics['containers'] = []
         metrics['docker_error'] = str(e)
     
-    logger.info(f"✅ Metrics collected: {metrics['containers_total']} containers, CPU {metrics['cpu_percent']}%, RAM {metrics['ram_percent']}%")
+    logger.info(
+        "✅ Metrics collected: %s containers, CPU %s%%, RAM %s%%",
+        metrics.get('containers_total', 0), metrics['cpu_percent'], metrics['ram_percent']
+    )
     
     return metrics
 
@@ -185,19 +245,25 @@ def analyze_for_critical_alerts(metrics: dict, config: dict, logger: logging.Log
         alert['has_critical'] = True
         alert['critical_issues'].append(f"{unhealthy} container(s) unhealthy")
     
-    # Check for containers with high restart counts
-    for container in metrics.get('containers', []):
-        restarts = container.get('restarts', 0)
-        if restarts >= thresholds.get('container_restart_critical', 5):
-            alert['has_critical'] = True
-            alert['critical_issues'].append(f"{container['name']}: {restarts} restarts")
-        elif restarts >= thresholds.get('container_restart_warning', 3):
-            alert['warnings'].append(f"{container['name']}: {restarts} restarts")
+    # Check for containers with high restart counts (skipped when even the
+    # highest count is below the warning threshold)
+    restart_warning = thresholds.get('container_restart_warning', 3)
+    restart_critical = thresholds.get('container_restart_critical', 5)
+    max_restarts = metrics.get('containers_max_restarts')
+    
+    if max_restarts is None or max_restarts >= min(restart_warning, restart_critical):
+        for container in metrics.get('containers', []):
+            restarts = container.get('restarts', 0)
+            if restarts >= restart_critical:
+                alert['has_critical'] = True
+                alert['critical_issues'].append(f"{container['name']}: {restarts} restarts")
+            elif restarts >= restart_warning:
+                alert['warnings'].append(f"{container['name']}: {restarts} restarts")
     
     if alert['has_critical']:
-        logger.warning(f"🚨 CRITICAL ALERT: {', '.join(alert['critical_issues'])}")
+        logger.warning("🚨 CRITICAL ALERT: %s", ', '.join(alert['critical_issues']))
     elif alert['warnings']:
-        logger.warning(f"⚠️  Warnings: {', '.join(alert['warnings'])}")
+        logger.warning("⚠️  Warnings: %s", ', '.join(alert['warnings']))
     else:
         logger.info("✅ All systems nominal")
     
@@ -216,8 +282,8 @@ def main():
     
     # Create config if requested
     if args.create_config:
-        config_path = Path(__file__).parent.parent / "config.json"
-        example_path = Path(__file__).parent.parent / "config.example.json"
+        config_path = _DEFAULT_CONFIG
+        example_path = _EXAMPLE_CONFIG
         
         if config_path.exists():
             print(f"⚠️  Config already exists: {config_path}")
@@ -242,9 +308,12 @@ def main():
     logger.info("🏥 ASMO-01 Health Monitor - Starting...")
     logger.info("=" * 60)
     
+    # One timestamp for the whole cycle
+    timestamp = datetime.now().isoformat()
+    
     try:
         # Collect metrics
-        metrics = collect_metrics(config, logger)
+        metrics = collect_metrics(config, logger, timestamp=timestamp)
         
         # Analyze for critical alerts
         alert_info = analyze_for_critical_alerts(metrics, config, logger)
@@ -259,7 +328,7 @@ def main():
                 retention_days=config['monitoring']['history_retention_days']
             )
             storage.add_entry(metrics)
-            logger.info(f"💾 Metrics saved to {config['paths']['history_file']}")
+            logger.info("💾 Metrics saved to %s", config['paths']['history_file'])
         
         # Output for n8n (JSON to stdout)
         output = {
@@ -279,22 +348,22 @@ def main():
         print("\n" + "=" * 60)
         print("📊 MONITOR OUTPUT (for n8n):")
         print("=" * 60)
-        print(json.dumps(output, indent=2))
+        print(dumps(output, indent=True))
         
         logger.info("✅ Monitor completed successfully")
         
         return 0
         
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}", exc_info=True)
+        logger.error("❌ Fatal error: %s", e, exc_info=True)
         
         # Output error for n8n
         error_output = {
             'success': False,
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
-        print(json.dumps(error_output, indent=2))
+        print(dumps(error_output, indent=True))
         
         return 1
 
@@ -10,16 +10,33 @@ This script is designed to be called by Claude Code for advanced analysis.
 
 import sys
 import json
+import functools
+import heapq
+import queue
+import atexit
 import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping
+
+# Default locations, relative to the repository root
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_DEFAULT_CONFIG = _REPO_ROOT / "config.json"
+_DEFAULT_HISTORY = _REPO_ROOT / "data" / "health_history.jsonl"
+_DEFAULT_LOG = _REPO_ROOT / "logs" / "asmo.log"
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(_REPO_ROOT))
 
 from utils.storage import HealthStorage
+from utils.serialization import dumps
+
+
+# Sort rank of problem severities (most severe first)
+_SEVERITY_ORDER = {'critical': 0, 'warning': 1, 'info': 2}
 
 
 def setup_logging(log_file: str, verbose: bool = False) -> logging.Logger:
@@ -28,94 +45,112 @@ def setup_logging(log_file: str, verbose: bool = False) -> logging.Logger:
     
     Path(log_file).parent.mkdir(parents=True, exist_ok=True)
     
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    
+    # File writes happen on a background listener thread; stdout stays
+    # synchronous so log lines never interleave with the JSON output
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
+            queue_handler,
+            stream_handler
         ]
     )
     
     return logging.getLogger(__name__)
 
 
-def load_config(config_path: str = None) -> dict:
-    """Load configuration from JSON file"""
+def load_config(config_path: str = None) -> Mapping:
+    """
+    Load configuration from JSON file
+    
+    The result is cached per resolved path and shared between callers, so
+    it is returned as a read-only mapping and must not be mutated.
+    """
     if config_path is None:
-        config_path = Path(__file__).parent.parent / "config.json"
+        config_path = _DEFAULT_CONFIG
     
+    return _load_config_cached(str(Path(config_path).resolve()))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path: str) -> Mapping:
+    """Parse a configuration file (see load_config)"""
     try:
         with open(config_path, 'r') as f:
-            return json.load(f)
+            return MappingProxyType(json.load(f))
     except FileNotFoundError:
         # Return default config
-        return {
+        return MappingProxyType({
             "paths": {
-                "history_file": str(Path(__file__).parent.parent / "data" / "health_history.json"),
-                "log_file": str(Path(__file__).parent.parent / "logs" / "asmo.log")
+                "history_file": str(_DEFAULT_HISTORY),
+                "log_file": str(_DEFAULT_LOG)
             },
             "reporting": {
                 "top_memory_containers": 5,
                 "top_cpu_containers": 5,
                 "max_errors_in_report": 10
             }
-        }
+        })
 
 
-def analyze_24h_trends(history: List[Dict]) -> Dict:
+def analyze_all(history: List[Dict], config: Dict) -> Dict:
     """
-    Analyze trends over the last 24 hours
+    Analyze the last 24 hours in a single pass over the history
+    
+    System trends and per-container statistics are accumulated in the same
+    loop, then the top resource consumers are selected from the result.
     
     Args:
         history: List of historical entries
+        config: Configuration dictionary
         
     Returns:
-        Dictionary with trend analysis
+        Dictionary with 'trends', 'container_stats' and 'top_resources'
     """
     if not history:
-        return {'error': 'No data available'}
-    
-    # Extract time series data
-    cpu_values = [h.get('cpu_percent', 0) for h in history]
-    ram_values = [h.get('ram_percent', 0) for h in history]
+        return {
+            'trends': {'error': 'No data available'},
+            'container_stats': {},
+            'top_resources': {'top_memory': [], 'top_cpu': []},
+        }
     
-    # Calculate statistics
-    trends = {
-        'cpu': {
-            'avg': round(sum(cpu_values) / len(cpu_values), 2) if cpu_values else 0,
-            'min': round(min(cpu_values), 2) if cpu_values else 0,
-            'max': round(max(cpu_values), 2) if cpu_values else 0,
-            'current': round(cpu_values[-1], 2) if cpu_values else 0,
-        },
-        'ram': {
-            'avg': round(sum(ram_values) / len(ram_values), 2) if ram_values else 0,
-            'min': round(min(ram_values), 2) if ram_values else 0,
-            'max': round(max(ram_values), 2) if ram_values else 0,
-            'current': round(ram_values[-1], 2) if ram_values else 0,
-        },
-        'data_points': len(history),
-        'time_span_hours': 24,
-    }
+    first = history[0]
+    cpu_sum = ram_sum = 0
+    cpu_min = cpu_max = first.get('cpu_percent', 0)
+    ram_min = ram_max = first.get('ram_percent', 0)
     
-    return trends
-
-
-def analyze_container_health(history: List[Dict], config: Dict) -> Dict:
-    """
-    Analyze container health patterns over 24h
-    
-    Args:
-        history: List of historical entries
-        config: Configuration dictionary
-        
-    Returns:
-        Dictionary with container analysis
-    """
-    # Aggregate container stats
+    # Aggregate container stats with running sums/maxima (no per-sample lists)
     container_stats = {}
     
     for entry in history:
+        # System trends: running sum/min/max of both series
+        cpu = entry.get('cpu_percent', 0)
+        ram = entry.get('ram_percent', 0)
+        
+        cpu_sum += cpu
+        if cpu < cpu_min:
+            cpu_min = cpu
+        elif cpu > cpu_max:
+            cpu_max = cpu
+        
+        ram_sum += ram
+        if ram < ram_min:
+            ram_min = ram
+        elif ram > ram_max:
+            ram_max = ram
+        
         for container in entry.get('containers', []):
             name = container['name']
             
@@ -125,9 +160,13 @@ def analyze_container_health(history: List[Dict], config: Dict) -> Dict:
                     'uptime_checks': 0,
                     'down_checks': 0,
                     'total_restarts': 0,
-                    'errors': [],
-                    'mem_values': [],
-                    'cpu_values': [],
+                    'errors': {},  # Insertion-ordered set
+                    'mem_samples': 0,
+                    'mem_sum': 0.0,
+                    'max_mem_mb': 0,
+                    'cpu_samples': 0,
+                    'cpu_sum': 0.0,
+                    'max_cpu_percent': 0,
                 }
             
             stats = container_stats[name]
@@ -141,40 +180,67 @@ def analyze_container_health(history: List[Dict], config: Dict) -> Dict:
             # Track restarts
             stats['total_restarts'] = max(stats['total_restarts'], container.get('restarts', 0))
             
-            # Collect resource usage
-            if container.get('mem_mb'):
-                stats['mem_values'].append(container['mem_mb'])
-            if container.get('cpu_percent'):
-                stats['cpu_values'].append(container['cpu_percent'])
+            # Accumulate resource usage
+            mem_mb = container.get('mem_mb')
+            if mem_mb:
+                stats['mem_samples'] += 1
+                stats['mem_sum'] += mem_mb
+                if mem_mb > stats['max_mem_mb']:
+                    stats['max_mem_mb'] = mem_mb
+            cpu_percent = container.get('cpu_percent')
+            if cpu_percent:
+                stats['cpu_samples'] += 1
+                stats['cpu_sum'] += cpu_percent
+                if cpu_percent > stats['max_cpu_percent']:
+                    stats['max_cpu_percent'] = cpu_percent
             
-            # Collect unique errors
-            for error in container.get('errors', []):
-                if error not in stats['errors']:
-                    stats['errors'].append(error)
+            # Collect unique errors, keeping first-seen order
+            stats['errors'].update(dict.fromkeys(container.get('errors', [])))
+    
+    count = len(history)
+    
+    # Calculate statistics
+    trends = {
+        'cpu': {
+            'avg': round(cpu_sum / count, 2),
+            'min': round(cpu_min, 2),
+            'max': round(cpu_max, 2),
+            'current': round(cpu, 2),
+        },
+        'ram': {
+            'avg': round(ram_sum / count, 2),
+            'min': round(ram_min, 2),
+            'max': round(ram_max, 2),
+            'current': round(ram, 2),
+        },
+        'data_points': count,
+        'time_span_hours': 24,
+    }
     
     # Calculate averages and uptime percentages
+    max_errors = config['reporting'].get('max_errors_in_report', 10)
     for name, stats in container_stats.items():
         total_checks = stats['uptime_checks'] + stats['down_checks']
         stats['uptime_percent'] = round((stats['uptime_checks'] / total_checks) * 100, 2) if total_checks > 0 else 0
         
-        if stats['mem_values']:
-            stats['avg_mem_mb'] = round(sum(stats['mem_values']) / len(stats['mem_values']), 2)
-            stats['max_mem_mb'] = round(max(stats['mem_values']), 2)
-        else:
-            stats['avg_mem_mb'] = 0
-            stats['max_mem_mb'] = 0
+        mem_samples = stats.pop('mem_samples')
+        mem_sum = stats.pop('mem_sum')
+        stats['avg_mem_mb'] = round(mem_sum / mem_samples, 2) if mem_samples else 0
+        stats['max_mem_mb'] = round(stats['max_mem_mb'], 2)
         
-        if stats['cpu_values']:
-            stats['avg_cpu_percent'] = round(sum(stats['cpu_values']) / len(stats['cpu_values']), 2)
-            stats['max_cpu_percent'] = round(max(stats['cpu_values']), 2)
-        else:
-            stats['avg_cpu_percent'] = 0
-            stats['max_cpu_percent'] = 0
+        cpu_samples = stats.pop('cpu_samples')
+        cpu_sum = stats.pop('cpu_sum')
+        stats['avg_cpu_percent'] = round(cpu_sum / cpu_samples, 2) if cpu_samples else 0
+        stats['max_cpu_percent'] = round(stats['max_cpu_percent'], 2)
         
         # Keep only first N errors
-        stats['errors'] = stats['errors'][:config['reporting'].get('max_errors_in_report', 10)]
+        stats['errors'] = list(stats['errors'])[:max_errors]
     
-    return container_stats
+    return {
+        'trends': trends,
+        'container_stats': container_stats,
+        'top_resources': get_top_resource_consumers(container_stats, config),
+    }
 
 
 def identify_problematic_containers(container_stats: Dict) -> List[Dict]:
@@ -190,25 +256,28 @@ def identify_problematic_containers(container_stats: Dict) -> List[Dict]:
     problems = []
     
     for name, stats in container_stats.items():
+        uptime = stats['uptime_percent']
+        restarts = stats['total_restarts']
+        errors = stats['errors']
         issues = []
         severity = 'info'
         
         # Check uptime
-        if stats['uptime_percent'] < 100:
-            issues.append(f"Uptime: {stats['uptime_percent']}%")
-            severity = 'warning' if stats['uptime_percent'] > 90 else 'critical'
+        if uptime < 100:
+            issues.append(f"Uptime: {uptime}%")
+            severity = 'warning' if uptime > 90 else 'critical'
         
         # Check restarts
-        if stats['total_restarts'] > 0:
-            issues.append(f"{stats['total_restarts']} restarts")
-            if stats['total_restarts'] >= 5:
+        if restarts > 0:
+            issues.append(f"{restarts} restarts")
+            if restarts >= 5:
                 severity = 'critical'
-            elif stats['total_restarts'] >= 3:
+            elif restarts >= 3:
                 severity = 'warning'
         
         # Check for errors
-        if stats['errors']:
-            issues.append(f"{len(stats['errors'])} error types")
+        if errors:
+            issues.append(f"{len(errors)} error types")
             if severity == 'info':
                 severity = 'warning'
         
@@ -217,17 +286,16 @@ def identify_problematic_containers(container_stats: Dict) -> List[Dict]:
                 'name': name,
                 'severity': severity,
                 'issues': issues,
-                'errors': stats['errors'][:3],  # Top 3 errors
+                'errors': errors[:3],  # Top 3 errors
                 'stats': {
-                    'uptime_percent': stats['uptime_percent'],
-                    'restarts': stats['total_restarts'],
+                    'uptime_percent': uptime,
+                    'restarts': restarts,
                     'avg_mem_mb': stats['avg_mem_mb'],
                 }
             })
     
     # Sort by severity
-    severity_order = {'critical': 0, 'warning': 1, 'info': 2}
-    problems.sort(key=lambda x: severity_order[x['severity']])
+    problems.sort(key=lambda x: _SEVERITY_ORDER[x['severity']])
     
     return problems
 
@@ -245,19 +313,19 @@ def get_top_resource_consumers(container_stats: Dict, config: Dict) -> Dict:
     """
     top_n = config['reporting'].get('top_memory_containers', 5)
     
-    # Sort by memory
-    by_memory = sorted(
+    # Top N by memory (partial selection, no full sort)
+    by_memory = heapq.nlargest(
+        top_n,
         container_stats.values(),
-        key=lambda x: x['avg_mem_mb'],
-        reverse=True
-    )[:top_n]
+        key=lambda x: x['avg_mem_mb']
+    )
     
-    # Sort by CPU
-    by_cpu = sorted(
+    # Top N by CPU
+    by_cpu = heapq.nlargest(
+        top_n,
         container_stats.values(),
-        key=lambda x: x['avg_cpu_percent'],
-        reverse=True
-    )[:top_n]
+        key=lambda x: x['avg_cpu_percent']
+    )
     
     return {
         'top_memory': [
@@ -279,13 +347,14 @@ def get_top_resource_consumers(container_stats: Dict, config: Dict) -> Dict:
     }
 
 
-def generate_discord_embed(analysis: Dict, latest_entry: Dict) -> Dict:
+def generate_discord_embed(analysis: Dict, latest_entry: Dict, now: datetime = None) -> Dict:
     """
     Generate a Discord embed from the analysis
     
     Args:
         analysis: Analysis results
         latest_entry: Most recent metrics entry
+        now: Report time shown in the footer (defaults to now)
         
     Returns:
         Discord embed dictionary
@@ -293,10 +362,15 @@ def generate_discord_embed(analysis: Dict, latest_entry: Dict) -> Dict:
     trends = analysis['trends']
     problems = analysis['problems']
     top_resources = analysis['top_resources']
+    now = now or datetime.now()
     
     # Determine overall status
-    critical_count = len([p for p in problems if p['severity'] == 'critical'])
-    warning_count = len([p for p in problems if p['severity'] == 'warning'])
+    critical_count = warning_count = 0
+    for p in problems:
+        if p['severity'] == 'critical':
+            critical_count += 1
+        elif p['severity'] == 'warning':
+            warning_count += 1
     
     if critical_count > 0:
         status_emoji = "🔴"
@@ -320,7 +394,7 @@ def generate_discord_embed(analysis: Dict, latest_entry: Dict) -> Dict:
             ),
             "fields": [],
             "footer": {
-                "text": f"Analysis of {trends['data_points']} data points • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "text": f"Analysis of {trends['data_points']} data points • {now.strftime('%Y-%m-%d %H:%M:%S')}"
             },
             "color": 15158332 if critical_count > 0 else (16776960 if warning_count > 0 else 3066993)
         }]
@@ -344,10 +418,10 @@ def generate_discord_embed(analysis: Dict, latest_entry: Dict) -> Dict:
     
     # Add problematic containers
     if problems:
-        problems_text = ""
-        for p in problems[:5]:  # Top 5 problems
-            icon = "🔥" if p['severity'] == 'critical' else "⚠️"
-            problems_text += f"{icon} **{p['name']}**: {', '.join(p['issues'])}\n"
+        problems_text = "".join([
+            f"{'🔥' if p['severity'] == 'critical' else '⚠️'} **{p['name']}**: {', '.join(p['issues'])}\n"
+            for p in problems[:5]  # Top 5 problems
+        ])
         
         embed["embeds"][0]["fields"].append({
             "name": "🚨 Issues Detected",
@@ -405,6 +479,10 @@ def main():
     logger.info("📊 ASMO-01 Daily Reporter - Starting...")
     logger.info("=" * 60)
     
+    # One timestamp for the whole run
+    now = datetime.now()
+    timestamp = now.isoformat()
+    
     try:
         # Load history
         storage = HealthStorage(
@@ -417,27 +495,24 @@ def main():
         
         if not history_24h:
             logger.error("❌ No data available for the last 24 hours")
-            print(json.dumps({'error': 'No data available'}, indent=2))
+            print(dumps({'error': 'No data available'}, indent=True))
             return 1
         
-        logger.info(f"📚 Loaded {len(history_24h)} data points from last 24h")
+        logger.info("📚 Loaded %d data points from last 24h", len(history_24h))
         
         # Perform analysis
-        logger.info("🔍 Analyzing trends...")
-        trends = analyze_24h_trends(history_24h)
-        
-        logger.info("🐳 Analyzing container health...")
-        container_stats = analyze_container_health(history_24h, config)
+        logger.info("🔍 Analyzing trends, container health and top consumers...")
+        results = analyze_all(history_24h, config)
+        trends = results['trends']
+        container_stats = results['container_stats']
+        top_resources = results['top_resources']
         
         logger.info("🚨 Identifying problems...")
         problems = identify_problematic_containers(container_stats)
         
-        logger.info("📊 Getting top resource consumers...")
-        top_resources = get_top_resource_consumers(container_stats, config)
-        
         # Compile analysis results
         analysis = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'trends': trends,
             'problems': problems,
             'top_resources': top_resources,
@@ -446,7 +521,7 @@ def main():
         
         # Generate Discord embed
         logger.info("📝 Generating Discord embed...")
-        embed = generate_discord_embed(analysis, latest_entry)
+        embed = generate_discord_embed(analysis, latest_entry, now=now)
         
         # Output results
         output = {
@@ -459,26 +534,26 @@ def main():
             print("\n" + "=" * 60)
             print("🔍 DETAILED ANALYSIS:")
             print("=" * 60)
-            print(json.dumps(analysis, indent=2))
+            print(dumps(analysis, indent=True))
         
         print("\n" + "=" * 60)
         print("📊 DISCORD EMBED (for n8n):")
         print("=" * 60)
-        print(json.dumps(embed, indent=2))
+        print(dumps(embed, indent=True))
         
         logger.info("✅ Report generated successfully")
         
         return 0
         
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}", exc_info=True)
+        logger.error("❌ Fatal error: %s", e, exc_info=True)
         
         error_output = {
             'success': False,
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
-        print(json.dumps(error_output, indent=2))
+        print(dumps(error_output, indent=True))
         
         return 1
 
@@ -44,11 +44,10 @@ if missing:
 # Test 3: Docker connection
 print("\n3️⃣  Checking Docker connection...")
 try:
-    import docker
-    client = docker.DockerClient(base_url="unix:///var/run/docker.sock")
+    from utils.docker_client import get_shared_client
+    client = get_shared_client("unix:///var/run/docker.sock")
     containers = client.containers.list()
     print(f"   ✅ Docker OK ({len(containers)} containers running)")
-    client.close()
 except Exception as e:
     print(f"   ❌ Docker connection failed: {e}")
     print("   Tip: Add your user to docker group: sudo usermod -aG docker $USER")
@@ -114,7 +113,7 @@ except Exception as e:
 print("\n8️⃣  Testing storage...")
 try:
     from utils.storage import HealthStorage
-    test_file = Path(__file__).parent.parent / "data" / "test_history.json"
+    test_file = Path(__file__).parent.parent / "data" / "test_history.jsonl"
     storage = HealthStorage(str(test_file), retention_days=7)
     
     # Add test entry
@@ -4,20 +4,124 @@ Docker client wrapper for collecting container metrics and logs
 
 import docker
 from typing import List, Dict, Optional
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+# Bytes per megabyte
+_MB = 1 << 20
+
+# Default cap on concurrent per-container requests to the Docker daemon
+_MAX_WORKERS = 16
+
+# Root of the cgroup filesystem. Container counters are read from here in a
+# single pass with no RPC; dockerd's Prometheus endpoint (metrics-addr in
+# daemon.json) only exposes engine-level metrics, not per-container usage,
+# so it cannot replace the per-container stats API fallback
+_CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+# Minimum wall-clock window between two cgroup CPU samples of a container
+_CPU_SAMPLE_WINDOW = 1.0
+
+# Upper bound on concurrent stats streams (extra containers are polled)
+_MAX_STREAMS = 128
+
+# A streamed frame older than this is stale (dockerd sends one per second)
+_STATS_STALE_AFTER = 10.0
+
+# Log lines worth reporting, as a single alternation scanned once over the
+# raw log bytes
+_ERROR_RE = re.compile(
+    rb'ERROR|Error|error:|ERR\]|CRITICAL|Exception|Failed|failed|WARN|Warning'
+)
+
+# Connections kept per shared client (docker-py defaults to 10, fewer than
+# the concurrent per-container requests)
+_POOL_SIZE = 32
+
+# Process-wide Docker clients, one per socket URL
+_CLIENTS: Dict[str, docker.DockerClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Previous cpu_stats of polled containers per (socket URL, container id),
+# used as CPU baseline for one-shot stats requests. Process-wide so it
+# outlives a single DockerMonitor; a fresh process starts without baselines
+_PREV_STATS: Dict[tuple, Dict] = {}
+_PREV_STATS_LOCK = threading.Lock()
+
+
+def get_shared_client(socket_url: str = "unix:///var/run/docker.sock") -> docker.DockerClient:
+    """
+    Get the process-wide Docker client of a socket, creating it on first use
+    
+    Sharing one client (and its connection pool) avoids a new socket
+    handshake and HTTP session per monitor instance.
+    
+    Args:
+        socket_url: Docker socket URL
+        
+    Returns:
+        Shared Docker client
+    """
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(socket_url)
+        if client is None:
+            client = _CLIENTS[socket_url] = docker.DockerClient(
+                base_url=socket_url, max_pool_size=_POOL_SIZE
+            )
+        return client
 
 
 class DockerMonitor:
     """Wrapper for Docker API to collect container metrics"""
     
-    def __init__(self, socket_url: str = "unix:///var/run/docker.sock"):
+    def __init__(self, socket_url: str = "unix:///var/run/docker.sock",
+                 stats_warmup_timeout: float = 2.0, max_workers: int = _MAX_WORKERS):
         """
         Initialize Docker client
         
         Args:
             socket_url: Docker socket URL
+            stats_warmup_timeout: Max seconds to wait (once per cycle, shared by
+                all containers) for freshly started stats streams to deliver
+                their first usable sample
+            max_workers: Max concurrent per-container requests to the daemon
         """
-        self.client = docker.DockerClient(base_url=socket_url)
+        self.socket_url = socket_url
+        self.client = get_shared_client(socket_url)
+        self.stats_warmup_timeout = stats_warmup_timeout
+        self.max_workers = max(1, max_workers)
+        
+        # First tag of each image id, refreshed once per cycle (None when the
+        # image listing failed)
+        self._image_tags: Optional[Dict[str, str]] = None
+        
+        # Latest (frame, monotonic_ts) per container id, fed by background
+        # stream readers
+        self._stats_lock = threading.Lock()
+        self._stats_cache: Dict[str, tuple] = {}
+        self._stats_ready: Dict[str, threading.Event] = {}
+        self._stats_stop: Dict[str, threading.Event] = {}
+        self._stats_threads: Dict[str, threading.Thread] = {}
+        self._stats_deadline = 0.0
+        
+        # cgroup accounting files per container id (None when not on sysfs),
+        # their descriptors kept open across cycles along with the start time
+        # of the container they were opened for, and the previous
+        # (cpu_usage_ns, monotonic_ts) sample per container
+        self._cgroup_paths: Dict[str, Optional[Dict[str, Path]]] = {}
+        self._cgroup_fds: Dict[str, Dict[str, int]] = {}
+        self._cgroup_started: Dict[str, str] = {}
+        self._prev: Dict[str, tuple] = {}
+        self._cpu_window_end = 0.0
+        
+        # The cgroup layout is host-wide: probe it once (unified v2 exposes
+        # cgroup.controllers at its root)
+        self._cgroup_v2 = (_CGROUP_ROOT / 'cgroup.controllers').exists()
     
     def get_all_containers(self, ignore_list: List[str] = None) -> List[Dict]:
         """
@@ -30,51 +134,146 @@ class DockerMonitor:
             List of container info dictionaries
         """
         ignore_list = ignore_list or []
-        containers = []
         
-        for container in self.client.containers.list(all=True):
-            name = container.name
+        # Per-container requests (inspect, stats, logs) are I/O-bound on the
+        # Docker socket, so issue them concurrently over the shared client
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # List once per cycle; running containers are read from cgroup
+            # sysfs when possible, the others get a stats stream
+            image_tags = pool.submit(self._list_image_tags)
+            listed = self._list_containers(ignore_list, pool)
+            self._image_tags = image_tags.result()
+            running = [c.id for c in listed if c.status == 'running']
+            for cid in set(self._cgroup_paths).difference(running):
+                self._forget_cgroup(cid)
+            
+            # A restart recreates the cgroup directory: descriptors and the CPU
+            # sample of the previous run are no longer valid
+            for c in listed:
+                if c.status != 'running':
+                    continue
+                started = c.attrs['State'].get('StartedAt')
+                if self._cgroup_started.get(c.id, started) != started:
+                    self._forget_cgroup(c.id)
+                    self._prev.pop(c.id, None)
+                self._cgroup_started[c.id] = started
+            
+            running_set = set(running)
+            with _PREV_STATS_LOCK:
+                for key in [k for k in _PREV_STATS if k[0] == self.socket_url and k[1] not in running_set]:
+                    del _PREV_STATS[key]
+            
+            on_sysfs = [cid for cid in running if self._get_cgroup_paths(cid)]
+            self._prime_cgroup_cpu(on_sysfs)
+            self.refresh_stats_streams([cid for cid in running if not self._cgroup_paths[cid]])
+            
+            return list(pool.map(self._get_container_info, listed))
+    
+    def _list_containers(self, ignore_list: List[str], pool: ThreadPoolExecutor) -> List:
+        """
+        List containers and inspect them concurrently
+        
+        The listing itself is a single low-level request returning plain
+        dicts; the inspects (needed for restart count, health, creation date
+        and PID) run on the shared worker pool.
+        
+        Args:
+            ignore_list: List of container names to ignore
+            pool: Worker pool for the per-container inspects
             
-            # Skip ignored containers
-            if name in ignore_list:
+        Returns:
+            List of inspected Docker container objects
+        """
+        ids = []
+        for summary in self.client.api.containers(all=True):
+            # Names may list link aliases (/app/db) before the container's own
+            # name, so check all of them
+            if any(name.lstrip('/') in ignore_list for name in summary.get('Names') or []):
                 continue
+            ids.append(summary['Id'])
+        
+        return [c for c in pool.map(self._inspect_container, ids) if c is not None]
+    
+    def _inspect_container(self, container_id: str):
+        """Inspect a container, None if it was removed since it was listed"""
+        try:
+            return self.client.containers.get(container_id)
+        except docker.errors.NotFound:
+            return None
+    
+    def _list_image_tags(self) -> Optional[Dict[str, str]]:
+        """
+        Map image ids to their first tag with a single listing request
+        
+        Returns:
+            Dictionary of image id to tag (untagged images are left out), or
+            None if images can't be listed
+        """
+        try:
+            images = self.client.api.images()
+        except docker.errors.DockerException:
+            return None
+        
+        tags = {}
+        for image in images:
+            repo_tags = [t for t in image.get('RepoTags') or [] if t != '<none>:<none>']
+            if repo_tags:
+                tags[image['Id']] = repo_tags[0]
+        return tags
+    
+    def _get_image_name(self, container) -> str:
+        """Get the first tag of a container's image, 'unknown' if untagged"""
+        if self._image_tags is not None:
+            return self._image_tags.get(container.attrs.get('Image'), 'unknown')
+        
+        # No listing available: inspect the image
+        image = container.image
+        return image.tags[0] if image.tags else 'unknown'
+    
+    def _get_container_info(self, container) -> Dict:
+        """
+        Build the info dictionary of a single container
+        
+        Args:
+            container: Docker container object
             
-            # Get basic info
-            info = {
-                'name': name,
-                'id': container.short_id,
-                'status': container.status,
-                'state': self._get_container_state(container),
-                'health': self._get_health_status(container),
-                'created': container.attrs['Created'],
-                'image': container.image.tags[0] if container.image.tags else 'unknown',
-            }
+        Returns:
+            Container info dictionary
+        """
+        # Get basic info
+        info = {
+            'name': container.name,
+            'id': container.short_id,
+            'status': container.status,
+            'state': self._get_container_state(container),
+            'health': self._get_health_status(container),
+            'created': container.attrs['Created'],
+            'image': self._get_image_name(container),
+        }
+        
+        # Get stats if running
+        if container.status == 'running':
+            stats = self._get_container_stats(container)
+            info.update(stats)
             
-            # Get stats if running
-            if container.status == 'running':
-                stats = self._get_container_stats(container)
-                info.update(stats)
-                
-                # Get restart count
-                info['restarts'] = container.attrs['RestartCount']
-                
-                # Get recent logs for errors
-                info['errors'] = self._get_container_errors(container)
-            else:
-                # Default values for stopped containers
-                info.update({
-                    'cpu_percent': 0.0,
-                    'mem_mb': 0.0,
-                    'mem_percent': 0.0,
-                    'net_rx_mb': 0.0,
-                    'net_tx_mb': 0.0,
-                    'restarts': container.attrs['RestartCount'],
-                    'errors': []
-                })
+            # Get restart count
+            info['restarts'] = container.attrs['RestartCount']
             
-            containers.append(info)
+            # Get recent logs for errors
+            info['errors'] = self._get_container_errors(container)
+        else:
+            # Default values for stopped containers
+            info.update({
+                'cpu_percent': 0.0,
+                'mem_mb': 0.0,
+                'mem_percent': 0.0,
+                'net_rx_mb': 0.0,
+                'net_tx_mb': 0.0,
+                'restarts': container.attrs['RestartCount'],
+                'errors': []
+            })
         
-        return containers
+        return info
     
     def _get_container_state(self, container) -> str:
         """Extract container state"""
@@ -88,6 +287,101 @@ class DockerMonitor:
         except KeyError:
             return None
     
+    def refresh_stats_streams(self, running_ids: List[str]) -> None:
+        """
+        Start a stats stream reader for each new running container and stop
+        the readers of containers that are gone
+        
+        Args:
+            running_ids: IDs of the containers currently running
+        """
+        wanted = set(running_ids)
+        
+        # Stop readers of containers that disappeared or whose stream ended
+        # or went stale; the latter are restarted below
+        for cid in list(self._stats_threads):
+            if cid not in wanted or not self._stats_threads[cid].is_alive() or self._is_stale(cid):
+                self._stop_stats_stream(cid)
+        
+        started = False
+        for cid in wanted:
+            if cid in self._stats_threads:
+                continue
+            if len(self._stats_threads) >= _MAX_STREAMS:
+                break
+            
+            self._stats_ready[cid] = threading.Event()
+            self._stats_stop[cid] = threading.Event()
+            thread = threading.Thread(
+                target=self._stream_stats,
+                args=(cid, self._stats_ready[cid], self._stats_stop[cid]),
+                name=f"stats-{cid[:12]}",
+                daemon=True,
+            )
+            self._stats_threads[cid] = thread
+            thread.start()
+            started = True
+        
+        # New streams share a single warm-up budget instead of one per container
+        if started:
+            self._stats_deadline = time.monotonic() + self.stats_warmup_timeout
+    
+    def _stream_stats(self, container_id: str, ready: threading.Event,
+                      stop: threading.Event) -> None:
+        """Background reader keeping the latest stats frame of a container"""
+        try:
+            for frame in self.client.api.stats(container_id, stream=True, decode=True):
+                if stop.is_set():
+                    break
+                
+                # The first frame has no previous sample to compute CPU against
+                if not frame.get('precpu_stats', {}).get('system_cpu_usage'):
+                    continue
+                
+                with self._stats_lock:
+                    self._stats_cache[container_id] = (frame, time.monotonic())
+                ready.set()
+        except Exception:
+            pass
+        finally:
+            # A replacement reader may already own the slot
+            with self._stats_lock:
+                if not stop.is_set():
+                    self._stats_cache.pop(container_id, None)
+            ready.set()
+    
+    def _stop_stats_stream(self, container_id: str) -> None:
+        """Signal a stats reader to stop and forget about it"""
+        self._stats_stop.pop(container_id, threading.Event()).set()
+        self._stats_ready.pop(container_id, None)
+        self._stats_threads.pop(container_id, None)
+        with self._stats_lock:
+            self._stats_cache.pop(container_id, None)
+    
+    def _is_stale(self, container_id: str) -> bool:
+        """Check whether the last streamed frame of a container is too old"""
+        with self._stats_lock:
+            cached = self._stats_cache.get(container_id)
+        return cached is not None and time.monotonic() - cached[1] > _STATS_STALE_AFTER
+    
+    def _get_cached_stats(self, container_id: str) -> Optional[Dict]:
+        """
+        Get the latest streamed stats frame of a container
+        
+        Only waits for streams started during this cycle, and never past the
+        shared warm-up deadline.
+        """
+        ready = self._stats_ready.get(container_id)
+        if ready is not None and not ready.is_set():
+            ready.wait(max(0.0, self._stats_deadline - time.monotonic()))
+        
+        with self._stats_lock:
+            cached = self._stats_cache.get(container_id)
+        
+        if cached is None or time.monotonic() - cached[1] > _STATS_STALE_AFTER:
+            return None
+        return cached[0]
+    
     def _get_container_stats(self, container) -> Dict:
         """
         Get resource usage stats for a running container
@@ -99,32 +393,15 @@ class DockerMonitor:
             Dictionary with CPU, memory, and network stats
         """
         try:
-            # Get stats (non-streaming)
-            stats = container.stats(stream=False)
-            
-            # Calculate CPU percentage
-            cpu_percent = self._calculate_cpu_percent(stats)
+            if self._get_cgroup_paths(container.id):
+                return self._get_cgroup_stats(container)
             
-            # Calculate memory usage
-            mem_usage = stats['memory_stats'].get('usage', 0)
-            mem_limit = stats['memory_stats'].get('limit', 1)
-            mem_mb = mem_usage / (1024 * 1024)
-            mem_percent = (mem_usage / mem_limit) * 100 if mem_limit > 0 else 0
+            # Use the streamed frame, falling back to polling
+            stats = self._get_cached_stats(container.id)
+            if stats is None:
+                return self._poll_stats(container)
             
-            # Calculate network I/O
-            networks = stats.get('networks', {})
-            net_rx_bytes = sum(net['rx_bytes'] for net in networks.values())
-            net_tx_bytes = sum(net['tx_bytes'] for net in networks.values())
-            net_rx_mb = net_rx_bytes / (1024 * 1024)
-            net_tx_mb = net_tx_bytes / (1024 * 1024)
-            
-            return {
-                'cpu_percent': round(cpu_percent, 2),
-                'mem_mb': round(mem_mb, 2),
-                'mem_percent': round(mem_percent, 2),
-                'net_rx_mb': round(net_rx_mb, 2),
-                'net_tx_mb': round(net_tx_mb, 2),
-            }
+            return self._compute_from_frame(stats)
         except Exception as e:
             # Return zeros if stats fail
             return {
@@ -135,21 +412,308 @@ class DockerMonitor:
                 'net_tx_mb': 0.0,
             }
     
-    def _calculate_cpu_percent(self, stats: Dict) -> float:
+    def _poll_stats(self, container) -> Dict:
+        """
+        Poll the stats of a container without a background stream
+        
+        Uses a one-shot request, which returns immediately instead of making
+        dockerd wait ~1 s for a second sample, with CPU computed against the
+        previous poll of the container in this process. The first poll of a
+        container (always the case for a one-shot run such as monitor.py),
+        or a daemon rejecting one-shot (API < 1.41), falls back to the
+        regular blocking request.
+        
+        Args:
+            container: Docker container object
+            
+        Returns:
+            Dictionary with CPU, memory, and network stats
+        """
+        key = (self.socket_url, container.id)
+        with _PREV_STATS_LOCK:
+            prev = _PREV_STATS.get(key)
+        
+        stats = None
+        if prev is not None:
+            try:
+                stats = self.client.api.stats(container.id, stream=False, one_shot=True)
+            except (docker.errors.InvalidVersion, docker.errors.APIError):
+                stats = None
+        if stats is None:
+            stats = container.stats(stream=False)
+            prev = None
+        
+        with _PREV_STATS_LOCK:
+            _PREV_STATS[key] = stats['cpu_stats']
+        return self._compute_from_frame(stats, prev)
+    
+    def _get_cgroup_paths(self, container_id: str) -> Optional[Dict[str, Path]]:
+        """
+        Locate the cgroup accounting files of a container (v1 or v2 layout,
+        cgroupfs or systemd driver)
+        
+        Args:
+            container_id: Full container ID
+            
+        Returns:
+            Dictionary of accounting file paths, or None if not available
+        """
+        if container_id in self._cgroup_paths:
+            return self._cgroup_paths[container_id]
+        
+        paths = None
+        for group in (f"docker/{container_id}", f"system.slice/docker-{container_id}.scope"):
+            if self._cgroup_v2:
+                # cgroup v2: a single unified directory
+                unified = _CGROUP_ROOT / group
+                if (unified / 'memory.current').exists():
+                    paths = {
+                        'cpu': unified / 'cpu.stat',
+                        'mem_usage': unified / 'memory.current',
+                        'mem_limit': unified / 'memory.max',
+                    }
+                    break
+            else:
+                # cgroup v1: one hierarchy per controller
+                memory = _CGROUP_ROOT / 'memory' / group
+                cpuacct = _CGROUP_ROOT / 'cpuacct' / group
+                if (memory / 'memory.usage_in_bytes').exists() and (cpuacct / 'cpuacct.usage').exists():
+                    paths = {
+                        'cpu': cpuacct / 'cpuacct.usage',
+                        'mem_usage': memory / 'memory.usage_in_bytes',
+                        'mem_limit': memory / 'memory.limit_in_bytes',
+                    }
+                    break
+        
+        self._cgroup_paths[container_id] = paths
+        return paths
+    
+    def _read_cgroup(self, container_id: str) -> Dict:
+        """
+        Read raw CPU and memory counters of a container from cgroup sysfs
+        
+        Args:
+            container_id: Full container ID
+            
+        Returns:
+            Dictionary with cpu_usage_ns, mem_usage and mem_limit (bytes)
+        """
+        cpu_raw = self._read_cgroup_file(container_id, 'cpu')
+        if self._cgroup_v2:
+            # cgroup v2 reports microseconds in a key/value file
+            fields = dict(line.split() for line in cpu_raw.splitlines() if line)
+            cpu_usage_ns = int(fields['usage_usec']) * 1000
+        else:
+            cpu_usage_ns = int(cpu_raw)
+        
+        # Unlimited containers are capped at the host memory, like docker stats
+        host_mem = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        limit_raw = self._read_cgroup_file(container_id, 'mem_limit').strip()
+        mem_limit = host_mem if limit_raw == 'max' else min(int(limit_raw), host_mem)
+        
+        return {
+            'cpu_usage_ns': cpu_usage_ns,
+            'mem_usage': int(self._read_cgroup_file(container_id, 'mem_usage')),
+            'mem_limit': mem_limit,
+        }
+    
+    def _read_cgroup_file(self, container_id: str, key: str) -> str:
+        """
+        Read a cgroup accounting file through a descriptor kept open across
+        cycles: one pread per read instead of open + read + close
+        
+        Args:
+            container_id: Full container ID
+            key: Accounting file key ('cpu', 'mem_usage', 'mem_limit')
+            
+        Returns:
+            File content
+        """
+        try:
+            return self._pread_cgroup_file(container_id, key)
+        except OSError:
+            # The descriptor may point at a cgroup removed since it was opened
+            # (e.g. container restarted): reopen once
+            self._close_cgroup_fds(container_id)
+            return self._pread_cgroup_file(container_id, key)
+    
+    def _pread_cgroup_file(self, container_id: str, key: str) -> str:
+        """Read a cgroup accounting file, opening its descriptor if needed"""
+        fds = self._cgroup_fds.setdefault(container_id, {})
+        fd = fds.get(key)
+        if fd is None:
+            fd = fds[key] = os.open(self._cgroup_paths[container_id][key], os.O_RDONLY)
+        
+        # Kernel-generated files are re-rendered on each read from offset 0
+        return os.pread(fd, 4096, 0).decode()
+    
+    def _close_cgroup_fds(self, container_id: str) -> None:
+        """Close the cgroup descriptors kept open for a container"""
+        for fd in self._cgroup_fds.pop(container_id, {}).values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def _forget_cgroup(self, container_id: str) -> None:
+        """Drop cached cgroup paths and close descriptors of a container"""
+        self._cgroup_paths.pop(container_id, None)
+        self._cgroup_started.pop(container_id, None)
+        self._close_cgroup_fds(container_id)
+    
+    def _prime_cgroup_cpu(self, container_ids: List[str]) -> None:
+        """
+        Take a first CPU sample for containers seen for the first time, so
+        their usage can be computed later in the same cycle
+        
+        Args:
+            container_ids: IDs of running containers readable from sysfs
+        """
+        primed = False
+        for cid in container_ids:
+            if cid in self._prev:
+                continue
+            try:
+                self._prev[cid] = (self._read_cgroup(cid)['cpu_usage_ns'], time.monotonic())
+                primed = True
+            except (OSError, KeyError, ValueError):
+                continue
+        
+        # All new containers share a single sampling window
+        if primed:
+            self._cpu_window_end = time.monotonic() + _CPU_SAMPLE_WINDOW
+        
+        # Forget containers that are no longer running
+        for cid in set(self._prev) - set(container_ids):
+            del self._prev[cid]
+    
+    def _get_cgroup_stats(self, container) -> Dict:
+        """
+        Get resource usage stats of a running container from cgroup sysfs
+        
+        Args:
+            container: Docker container object
+            
+        Returns:
+            Dictionary with CPU, memory, and network stats
+        """
+        remaining = self._cpu_window_end - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        
+        sample = self._read_cgroup(container.id)
+        now = time.monotonic()
+        
+        # CPU% against the previous sample, relative to one core like docker stats
+        cpu_percent = 0.0
+        prev = self._prev.get(container.id)
+        if prev and now > prev[1]:
+            cpu_delta = sample['cpu_usage_ns'] - prev[0]
+            cpu_percent = max(cpu_delta, 0) / ((now - prev[1]) * 1e9) * 100.0
+        self._prev[container.id] = (sample['cpu_usage_ns'], now)
+        
+        mem_usage = sample['mem_usage']
+        mem_limit = sample['mem_limit']
+        
+        # Only a container's own namespace is counted: host networking would
+        # sum the host interfaces, and container:<id> shares (and would count
+        # again) another container's traffic. The stats API reports 0 for both
+        network_mode = container.attrs.get('HostConfig', {}).get('NetworkMode') or ''
+        if network_mode == 'host' or network_mode.startswith('container:'):
+            net_rx_bytes = net_tx_bytes = 0
+        else:
+            net_rx_bytes, net_tx_bytes = self._read_net_dev(container.attrs['State']['Pid'])
+        
+        return {
+            'cpu_percent': round(cpu_percent, 2),
+            'mem_mb': round(mem_usage / _MB, 2),
+            'mem_percent': round((mem_usage / mem_limit) * 100 if mem_limit > 0 else 0, 2),
+            'net_rx_mb': round(net_rx_bytes / _MB, 2),
+            'net_tx_mb': round(net_tx_bytes / _MB, 2),
+        }
+    
+    def _read_net_dev(self, pid: int) -> tuple:
+        """
+        Sum received/transmitted bytes over the network interfaces of a
+        container, read from its network namespace
+        
+        Args:
+            pid: PID of the container's main process
+            
+        Returns:
+            Tuple of (rx_bytes, tx_bytes)
+        """
+        rx_bytes = tx_bytes = 0
+        try:
+            with open(f"/proc/{pid}/net/dev") as f:
+                # Skip the two header lines
+                for line in f.readlines()[2:]:
+                    iface, _, counters = line.partition(':')
+                    if iface.strip() == 'lo':
+                        continue
+                    fields = counters.split()
+                    rx_bytes += int(fields[0])
+                    tx_bytes += int(fields[8])
+        except (OSError, ValueError, IndexError):
+            pass
+        
+        return rx_bytes, tx_bytes
+    
+    def _compute_from_frame(self, stats: Dict, prev: Optional[Dict] = None) -> Dict:
+        """
+        Compute resource usage from a raw Docker stats frame
+        
+        Args:
+            stats: Docker stats dictionary
+            prev: Previous cpu_stats to compute CPU against (defaults to the
+                frame's own precpu_stats)
+            
+        Returns:
+            Dictionary with CPU, memory, and network stats
+        """
+        # Calculate CPU percentage
+        cpu_percent = self._calculate_cpu_percent(stats, prev)
+        
+        # Calculate memory usage
+        mem_usage = stats['memory_stats'].get('usage', 0)
+        mem_limit = stats['memory_stats'].get('limit', 1)
+        mem_mb = mem_usage / _MB
+        mem_percent = (mem_usage / mem_limit) * 100 if mem_limit > 0 else 0
+        
+        # Calculate network I/O
+        networks = stats.get('networks', {})
+        net_rx_bytes = sum(net['rx_bytes'] for net in networks.values())
+        net_tx_bytes = sum(net['tx_bytes'] for net in networks.values())
+        net_rx_mb = net_rx_bytes / _MB
+        net_tx_mb = net_tx_bytes / _MB
+        
+        return {
+            'cpu_percent': round(cpu_percent, 2),
+            'mem_mb': round(mem_mb, 2),
+            'mem_percent': round(mem_percent, 2),
+            'net_rx_mb': round(net_rx_mb, 2),
+            'net_tx_mb': round(net_tx_mb, 2),
+        }
+    
+    def _calculate_cpu_percent(self, stats: Dict, prev: Optional[Dict] = None) -> float:
         """
         Calculate CPU usage percentage
         
         Args:
             stats: Docker stats dictionary
+            prev: Previous cpu_stats (one-shot frames carry no precpu_stats)
             
         Returns:
             CPU percentage
         """
+        if prev is None:
+            prev = stats.get('precpu_stats', {})
+        
         try:
             cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
-                       stats['precpu_stats']['cpu_usage']['total_usage']
+                       prev['cpu_usage']['total_usage']
             system_delta = stats['cpu_stats']['system_cpu_usage'] - \
-                          stats['precpu_stats']['system_cpu_usage']
+                          prev['system_cpu_usage']
             
             cpu_count = stats['cpu_stats'].get('online_cpus', 1)
             
@@ -172,32 +736,36 @@ class DockerMonitor:
             List of error messages
         """
         try:
-            logs = container.logs(tail=lines, timestamps=False).decode('utf-8', errors='ignore')
+            # Scan the raw bytes and only decode the matching lines
+            logs = container.logs(tail=lines, timestamps=False)
             
+            # Jump from match to match and cut out the enclosing line, instead
+            # of running every pattern over every line
             errors = []
-            error_patterns = [
-                r'ERROR',
-                r'Error',
-                r'error:',
-                r'ERR\]',
-                r'CRITICAL',
-                r'Exception',
-                r'Failed',
-                r'failed',
-                r'WARN',
-                r'Warning',
-            ]
-            
-            for line in logs.split('\n'):
-                line = line.strip()
-                if any(re.search(pattern, line) for pattern in error_patterns):
-                    # Limit line length
-                    if len(line) > 200:
-                        line = line[:197] + "..."
+            seen = set()
+            match = _ERROR_RE.search(logs)
+            while match:
+                start = logs.rfind(b'\n', 0, match.start()) + 1
+                end = logs.find(b'\n', match.end())
+                if end == -1:
+                    end = len(logs)
+                
+                line = logs[start:end].decode('utf-8', errors='ignore').strip()
+                # Limit line length
+                if len(line) > 200:
+                    line = line[:197] + "..."
+                
+                # Unique errors in order, max 10 per container: stop scanning
+                # once they are collected
+                if line not in seen:
+                    seen.add(line)
                     errors.append(line)
+                    if len(errors) == 10:
+                        break
+                
+                match = _ERROR_RE.search(logs, end)
             
-            # Return unique errors (deduplicate)
-            return list(dict.fromkeys(errors))[:10]  # Max 10 errors per container
+            return errors
             
         except Exception:
             return []
@@ -224,6 +792,21 @@ class DockerMonitor:
                 'error': str(e)
             }
     
-    def close(self):
-        """Close Docker client connection"""
-        self.client.close()
+    def close(self, shutdown: bool = False):
+        """
+        Stop stats streams and release cgroup descriptors
+        
+        Args:
+            shutdown: Also close the shared Docker client (other monitors on
+                the same socket get a new one on their next creation)
+        """
+        for cid in list(self._stats_threads):
+            self._stop_stats_stream(cid)
+        for cid in list(self._cgroup_paths):
+            self._forget_cgroup(cid)
+        
+        if shutdown:
+            with _CLIENTS_LOCK:
+                if _CLIENTS.get(self.socket_url) is self.client:
+                    del _CLIENTS[self.socket_url]
+            self.client.close()
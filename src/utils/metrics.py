@@ -3,13 +3,72 @@ System metrics collection (CPU, RAM, Disk)
 """
 
 import psutil
-from typing import Dict, List
+from typing import Dict, List, Optional
 import subprocess
+import sys
+import time
+
+
+# Byte units
+_MB = 1 << 20
+_GB = 1 << 30
+
+# Filesystems left out of disk usage
+_PSEUDO_FS = frozenset(('tmpfs', 'devtmpfs', 'squashfs'))
+
+# Seconds the mounted partition list is reused before being read again
+_PARTITIONS_TTL = 60.0
+
+# Minimum window between two CPU samples; re-entering sooner returns the
+# cached reading instead of a meaningless near-zero delta
+_MIN_INTERVAL = 1.0
+
+# Prime psutil's CPU counters so the first real call measures since import
+psutil.cpu_percent(interval=None)
+_last_cpu_call_ts = time.monotonic()
+_last_cpu_stats: Optional[Dict] = None
+
+# On Linux, memory, network and uptime counters are read straight from /proc
+# (one read per file, no per-call objects); psutil covers other platforms and
+# anything /proc can't provide
+_LINUX = sys.platform.startswith('linux')
+
+
+def _read_proc(name: str) -> bytes:
+    """Read a /proc file in one go"""
+    with open(f"/proc/{name}", 'rb') as f:
+        return f.read()
+
+
+def _read_meminfo() -> Dict[bytes, int]:
+    """Parse /proc/meminfo into byte counts keyed by field name"""
+    meminfo = {}
+    for line in _read_proc('meminfo').splitlines():
+        fields = line.split()
+        meminfo[fields[0].rstrip(b':')] = int(fields[1]) * 1024
+    return meminfo
+
+
+def _percent(part: float, total: float) -> float:
+    """Percentage rounded like psutil, 0 when total is 0"""
+    return round(part / total * 100, 1) if total else 0.0
 
 
 class SystemMetrics:
     """Collects system-level metrics (CPU, RAM, Disk)"""
     
+    def __init__(self, partitions_ttl: float = _PARTITIONS_TTL):
+        """
+        Initialize metrics collector
+        
+        Args:
+            partitions_ttl: Seconds to reuse the list of mounted partitions
+                (the layout rarely changes, only usage is read every time)
+        """
+        self.partitions_ttl = partitions_ttl
+        self._partitions_cache: List = []
+        self._partitions_cache_ts: Optional[float] = None
+    
     @staticmethod
     def get_cpu_stats() -> Dict:
         """
@@ -18,15 +77,31 @@ class SystemMetrics:
         Returns:
             Dictionary with CPU metrics
         """
-        cpu_percent = psutil.cpu_percent(interval=1)
+        global _last_cpu_call_ts, _last_cpu_stats
+        
+        elapsed = time.monotonic() - _last_cpu_call_ts
+        if elapsed < _MIN_INTERVAL:
+            if _last_cpu_stats is not None:
+                return dict(_last_cpu_stats)
+            # First reading right after the import-time prime: wait out the
+            # window. Not waiting would mean either a since-boot average from
+            # /proc/stat or a window overlapping the monitor's own Docker pass,
+            # neither of which is a fair current-load reading for thresholds
+            time.sleep(_MIN_INTERVAL - elapsed)
+        
+        # Non-blocking: delta since the previous call
+        cpu_percent = psutil.cpu_percent(interval=None)
         cpu_count = psutil.cpu_count()
         cpu_freq = psutil.cpu_freq()
         
-        return {
+        _last_cpu_call_ts = time.monotonic()
+        _last_cpu_stats = {
             'cpu_percent': round(cpu_percent, 2),
             'cpu_count': cpu_count,
             'cpu_freq_mhz': round(cpu_freq.current, 2) if cpu_freq else None,
         }
+        
+        return dict(_last_cpu_stats)
     
     @staticmethod
     def get_memory_stats() -> Dict:
@@ -36,21 +111,54 @@ class SystemMetrics:
         Returns:
             Dictionary with memory metrics
         """
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        mem = swap = None
+        if _LINUX:
+            try:
+                meminfo = _read_meminfo()
+                total = meminfo[b'MemTotal']
+                available = meminfo[b'MemAvailable']
+                # Same "used" definition as the pinned psutil (5.9)
+                used = total - meminfo[b'MemFree'] - meminfo.get(b'Buffers', 0) - \
+                    meminfo.get(b'Cached', 0) - meminfo.get(b'SReclaimable', 0)
+                if used < 0:
+                    used = total - meminfo[b'MemFree']
+                mem = (total, used, available, _percent(total - available, total))
+                
+                swap_total = meminfo[b'SwapTotal']
+                swap_used = swap_total - meminfo[b'SwapFree']
+                swap = (swap_total, swap_used, _percent(swap_used, swap_total))
+            except (OSError, KeyError, ValueError, IndexError):
+                mem = swap = None
+        
+        if mem is None:
+            vm = psutil.virtual_memory()
+            sw = psutil.swap_memory()
+            mem = (vm.total, vm.used, vm.available, vm.percent)
+            swap = (sw.total, sw.used, sw.percent)
         
         return {
-            'ram_total_gb': round(mem.total / (1024**3), 2),
-            'ram_used_gb': round(mem.used / (1024**3), 2),
-            'ram_available_gb': round(mem.available / (1024**3), 2),
-            'ram_percent': round(mem.percent, 2),
-            'swap_total_gb': round(swap.total / (1024**3), 2),
-            'swap_used_gb': round(swap.used / (1024**3), 2),
-            'swap_percent': round(swap.percent, 2),
+            'ram_total_gb': round(mem[0] / _GB, 2),
+            'ram_used_gb': round(mem[1] / _GB, 2),
+            'ram_available_gb': round(mem[2] / _GB, 2),
+            'ram_percent': round(mem[3], 2),
+            'swap_total_gb': round(swap[0] / _GB, 2),
+            'swap_used_gb': round(swap[1] / _GB, 2),
+            'swap_percent': round(swap[2], 2),
         }
     
-    @staticmethod
-    def get_disk_stats() -> List[Dict]:
+    def _get_partitions(self) -> List:
+        """Get mounted real partitions, re-read at most every partitions_ttl seconds"""
+        now = time.monotonic()
+        if self._partitions_cache_ts is None or now - self._partitions_cache_ts > self.partitions_ttl:
+            # Skip pseudo filesystems
+            self._partitions_cache = [
+                p for p in psutil.disk_partitions(all=False) if p.fstype not in _PSEUDO_FS
+            ]
+            self._partitions_cache_ts = now
+        
+        return self._partitions_cache
+    
+    def get_disk_stats(self) -> List[Dict]:
         """
         Get disk usage for all mounted partitions
         
@@ -59,11 +167,7 @@ class SystemMetrics:
         """
         disks = []
         
-        for partition in psutil.disk_partitions(all=False):
-            # Skip pseudo filesystems
-            if partition.fstype in ['tmpfs', 'devtmpfs', 'squashfs']:
-                continue
-            
+        for partition in self._get_partitions():
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 
@@ -71,13 +175,13 @@ class SystemMetrics:
                     'mount': partition.mountpoint,
                     'device': partition.device,
                     'fstype': partition.fstype,
-                    'total_gb': round(usage.total / (1024**3), 2),
-                    'used_gb': round(usage.used / (1024**3), 2),
-                    'free_gb': round(usage.free / (1024**3), 2),
+                    'total_gb': round(usage.total / _GB, 2),
+                    'used_gb': round(usage.used / _GB, 2),
+                    'free_gb': round(usage.free / _GB, 2),
                     'used_percent': round(usage.percent, 2),
                 })
-            except PermissionError:
-                # Skip partitions we can't access
+            except (PermissionError, FileNotFoundError):
+                # Skip partitions we can't access (or unmounted since listed)
                 continue
         
         return disks
@@ -90,15 +194,35 @@ class SystemMetrics:
         Returns:
             Dictionary with network metrics
         """
-        net_io = psutil.net_io_counters()
+        counters = None
+        if _LINUX:
+            try:
+                # Sum over all interfaces (loopback included, like psutil);
+                # per line: rx bytes packets errs ... tx bytes packets errs ...
+                counters = [0] * 6
+                for line in _read_proc('net/dev').splitlines()[2:]:
+                    fields = line.partition(b':')[2].split()
+                    counters[0] += int(fields[8])
+                    counters[1] += int(fields[0])
+                    counters[2] += int(fields[9])
+                    counters[3] += int(fields[1])
+                    counters[4] += int(fields[2])
+                    counters[5] += int(fields[10])
+            except (OSError, ValueError, IndexError):
+                counters = None
+        
+        if counters is None:
+            net_io = psutil.net_io_counters()
+            counters = (net_io.bytes_sent, net_io.bytes_recv, net_io.packets_sent,
+                        net_io.packets_recv, net_io.errin, net_io.errout)
         
         return {
-            'bytes_sent_mb': round(net_io.bytes_sent / (1024**2), 2),
-            'bytes_recv_mb': round(net_io.bytes_recv / (1024**2), 2),
-            'packets_sent': net_io.packets_sent,
-            'packets_recv': net_io.packets_recv,
-            'errors_in': net_io.errin,
-            'errors_out': net_io.errout,
+            'bytes_sent_mb': round(counters[0] / _MB, 2),
+            'bytes_recv_mb': round(counters[1] / _MB, 2),
+            'packets_sent': counters[2],
+            'packets_recv': counters[3],
+            'errors_in': counters[4],
+            'errors_out': counters[5],
         }
     
     @staticmethod
@@ -109,8 +233,17 @@ class SystemMetrics:
         Returns:
             Dictionary with uptime info
         """
-        boot_time = psutil.boot_time()
-        uptime_seconds = psutil.time.time() - boot_time
+        uptime_seconds = None
+        if _LINUX:
+            try:
+                uptime_seconds = float(_read_proc('uptime').split()[0])
+                boot_time = time.time() - uptime_seconds
+            except (OSError, ValueError, IndexError):
+                uptime_seconds = None
+        
+        if uptime_seconds is None:
+            boot_time = psutil.boot_time()
+            uptime_seconds = time.time() - boot_time
         
         # Convert to days, hours, minutes
         days = int(uptime_seconds // 86400)
@@ -181,6 +314,10 @@ class SystemMetrics:
         return violations
 
 
+# Shared collector, so cached state (partition list) survives across calls
+_system_metrics = SystemMetrics()
+
+
 def get_all_system_metrics() -> Dict:
     """
     Convenience function to get all system metrics at once
@@ -188,7 +325,7 @@ def get_all_system_metrics() -> Dict:
     Returns:
         Dictionary with all metrics
     """
-    metrics = SystemMetrics()
+    metrics = _system_metrics
     
     return {
         'cpu': metrics.get_cpu_stats(),
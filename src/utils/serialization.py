@@ -0,0 +1,67 @@
+"""
+JSON serialization helpers (orjson when installed, stdlib json otherwise)
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def dumps(obj, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string
+    
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with 2-space indentation
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def dumps_bytes(obj) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON, for binary file writes
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    
+    return json.dumps(obj).encode('utf-8')
+
+
+def loads(data):
+    """
+    Deserialize a JSON document
+    
+    Args:
+        data: JSON text, as str or bytes
+        
+    Returns:
+        Deserialized object
+        
+    Raises:
+        ValueError: If the document is invalid JSON (json.JSONDecodeError)
+            or, given as bytes, invalid UTF-8 (UnicodeDecodeError)
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (e.g. NaN written by json.dumps)
+            pass
+    
+    return json.loads(data)
@@ -1,53 +1,221 @@
 """
-Storage utility for managing health history JSON file
+Storage utility for managing health history JSON Lines file
 """
 
-import json
+import math
 import os
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
 
+from .serialization import dumps_bytes, loads
+
+
+# Expired entries are pruned in batches: the file is only rewritten once the
+# oldest entry is this far past retention (about once a day at hourly cadence)
+_PRUNE_GRACE = timedelta(days=1)
+
+# Block size used when reading the history backwards from its end
+_TAIL_BLOCK = 64 * 1024
+
+# Bytes per megabyte
+_MB = 1 << 20
+
 
 class HealthStorage:
-    """Manages the health history JSON storage with automatic cleanup"""
+    """
+    Manages the health history storage with automatic cleanup
+    
+    History is stored as JSON Lines (one entry per line, oldest first), so
+    adding an entry is a plain append and recent entries can be read from
+    the end of the file without parsing the whole history.
+    """
     
     def __init__(self, history_file: str, retention_days: int = 7):
         """
         Initialize storage manager
         
         Args:
-            history_file: Path to the JSON history file
+            history_file: Path to the JSON Lines history file
             retention_days: Number of days to keep history
         """
         self.history_file = Path(history_file)
         self.retention_days = retention_days
         
+        # Parsed history with the (mtime_ns, size) of the file it came from,
+        # and the POSIX time of each entry (built on demand) for bisection
+        self._cache_key: Optional[tuple] = None
+        self._cached_history: List[Dict] = []
+        self._cached_epochs: Optional[array] = None
+        
         # Ensure directory exists
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Initialize empty file if doesn't exist
+        # Initialize the file if it doesn't exist, carrying over the history of
+        # a sibling .json file (the former default name) when there is one
         if not self.history_file.exists():
-            self._write_history([])
+            legacy_file = self.history_file.with_suffix('.json')
+            if legacy_file != self.history_file and legacy_file.exists():
+                self._migrate_legacy_format(legacy_file)
+            if not self.history_file.exists():
+                self._write_history([])
+        else:
+            self._migrate_legacy_format(self.history_file)
+    
+    def _migrate_legacy_format(self, source: Path) -> None:
+        """
+        Convert a history file written as a single JSON array to JSON Lines
+        
+        Args:
+            source: File to convert into history_file (left untouched when
+                it is another file)
+        """
+        with open(source, 'rb') as f:
+            head = f.read(64).lstrip()
+        
+        if not head.startswith(b'['):
+            # Already JSON Lines: only a sibling file needs copying over
+            if source != self.history_file:
+                self._write_history(self._parse_lines(source.read_bytes().splitlines()))
+            return
+        
+        try:
+            data = loads(source.read_bytes())
+        except ValueError:
+            # Invalid JSON or UTF-8
+            return
+        
+        self._write_history(data if isinstance(data, list) else [])
+    
+    def _parse_lines(self, lines: List[bytes]) -> List[Dict]:
+        """Parse JSON Lines, skipping blank or truncated lines"""
+        entries = []
+        for line in lines:
+            entry = self._parse_line(line)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+    
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[Dict]:
+        """Parse a single history line, None if blank or invalid"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            entry = loads(line)
+        except ValueError:
+            # Invalid JSON or UTF-8 (e.g. a line cut off mid-character)
+            return None
+        return entry if isinstance(entry, dict) else None
+    
+    def _read_lines(self) -> List[bytes]:
+        """Read raw history lines (bytes, parsed without a decode pass)"""
+        try:
+            with open(self.history_file, 'rb') as f:
+                return f.readlines()
+        except FileNotFoundError:
+            return []
+    
+    def _read_lines_reversed(self):
+        """Yield raw history lines newest first, reading the file backwards in blocks"""
+        try:
+            f = open(self.history_file, 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            partial = b''
+            while pos > 0:
+                size = min(_TAIL_BLOCK, pos)
+                pos -= size
+                f.seek(pos)
+                lines = (f.read(size) + partial).split(b'\n')
+                # The first line may continue in the previous block
+                partial = lines[0]
+                yield from reversed(lines[1:])
+            yield partial
+    
+    def _iter_newest_first(self):
+        """Yield parsed entries from the end of the file, newest first"""
+        for line in self._read_lines_reversed():
+            entry = self._parse_line(line)
+            if entry is not None:
+                yield entry
+    
+    @staticmethod
+    def _entry_epoch(entry: Dict) -> Optional[float]:
+        """
+        Get the POSIX time of an entry, None if it has no valid timestamp
+        
+        Uses the ts_epoch stored at write time, and only parses the ISO
+        timestamp for entries written before it existed.
+        """
+        epoch = entry.get('ts_epoch')
+        if epoch is not None:
+            return epoch
+        try:
+            return datetime.fromisoformat(entry['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def _epochs(self, history: List[Dict]) -> List[float]:
+        """POSIX time of each entry, +inf for entries without valid timestamp"""
+        epochs = []
+        for entry in history:
+            epoch = self._entry_epoch(entry)
+            epochs.append(math.inf if epoch is None else epoch)
+        return epochs
     
     def load_history(self) -> List[Dict]:
         """
         Load all history entries from file
         
+        The parsed history is cached until the file changes (modification
+        time or size, so writes from other processes are picked up too).
+        
         Returns:
             List of history entries
         """
         try:
-            with open(self.history_file, 'r') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+            stat = self.history_file.stat()
+        except FileNotFoundError:
+            stat = None
+        
+        key = (stat.st_mtime_ns, stat.st_size) if stat else None
+        if key is None or key != self._cache_key:
+            self._cached_history = self._parse_lines(self._read_lines()) if stat else []
+            self._cached_epochs = None
+            self._cache_key = key
+        
+        return list(self._cached_history)
+    
+    def _load_indexed(self) -> tuple:
+        """
+        Load history along with a parallel array of entry POSIX times
+        
+        Returns:
+            Tuple of (entries, epochs), cached together until the file changes
+        """
+        history = self.load_history()
+        if self._cached_epochs is None:
+            self._cached_epochs = array('d', self._epochs(history))
+        return history, self._cached_epochs
     
     def _write_history(self, data: List[Dict]) -> None:
-        """Write history to file"""
-        with open(self.history_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Rewrite the whole history file atomically (temp file + rename)"""
+        tmp_file = self.history_file.with_name(self.history_file.name + '.tmp')
+        
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(dumps_bytes(entry) + b'\n' for entry in data))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(tmp_file, self.history_file)
+        self._cache_key = None
     
     def add_entry(self, entry: Dict) -> None:
         """
@@ -60,41 +228,88 @@ class HealthStorage:
         if 'timestamp' not in entry:
             entry['timestamp'] = datetime.now().isoformat()
         
-        # Load current history
-        history = self.load_history()
+        # Store the numeric time too, so reads compare numbers instead of
+        # parsing ISO strings
+        if 'ts_epoch' not in entry:
+            epoch = self._entry_epoch(entry)
+            if epoch is not None:
+                entry['ts_epoch'] = epoch
+        
+        # Append new entry in a single write, no rewrite of the existing history.
+        # A last line cut off (crash, full disk) lacks its newline: terminate
+        # it first so the new entry doesn't get glued onto it
+        line = dumps_bytes(entry) + b'\n'
+        with open(self.history_file, 'ab+') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+        self._cache_key = None
+        
+        # Cleanup old entries in batches instead of rewriting on every add
+        if self._oldest_entry_expired():
+            self.compact()
+    
+    def compact(self) -> int:
+        """
+        Rewrite the history file without entries older than retention_days
+        
+        Runs automatically from add_entry once expired entries have piled up
+        for a while; can also be called directly (e.g. from a maintenance job).
         
-        # Add new entry
-        history.append(entry)
+        Returns:
+            Number of entries removed
+        """
+        history, epochs = self._load_indexed()
+        kept = self._cleanup_old_entries(history, epochs)
+        self._write_history(kept)
+        return len(history) - len(kept)
+    
+    def _oldest_entry_expired(self) -> bool:
+        """Check whether the first dated entry of the file is past retention + grace"""
+        cutoff = (datetime.now() - timedelta(days=self.retention_days) - _PRUNE_GRACE).timestamp()
         
-        # Cleanup old entries
-        history = self._cleanup_old_entries(history)
+        with open(self.history_file, 'rb') as f:
+            for line in f:
+                entry = self._parse_line(line)
+                epoch = self._entry_epoch(entry) if entry is not None else None
+                if epoch is None:
+                    # Undated entries are never pruned, look past them
+                    continue
+                return epoch < cutoff
         
-        # Save
-        self._write_history(history)
+        return False
     
-    def _cleanup_old_entries(self, history: List[Dict]) -> List[Dict]:
+    def _cleanup_old_entries(self, history: List[Dict], epochs=None) -> List[Dict]:
         """
         Remove entries older than retention_days
         
         Args:
             history: List of history entries
+            epochs: POSIX time of each entry, computed when not given
             
         Returns:
             Filtered list
         """
-        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).timestamp()
         
-        filtered = []
-        for entry in history:
-            try:
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                if entry_time >= cutoff:
-                    filtered.append(entry)
-            except (KeyError, ValueError):
-                # Keep entries without valid timestamp (better safe than sorry)
-                filtered.append(entry)
+        # Entries are appended in time order: binary search the cutoff, with
+        # undated entries (+inf) taking the time of the previous dated one so
+        # the sequence stays sorted
+        if epochs is None:
+            epochs = self._epochs(history)
+        keys = []
+        last = -math.inf
+        for epoch in epochs:
+            if epoch != math.inf:
+                last = epoch
+            keys.append(last)
+        idx = bisect_left(keys, cutoff)
         
-        return filtered
+        # Keep entries without valid timestamp (better safe than sorry)
+        kept = [entry for entry, epoch in zip(history[:idx], epochs) if epoch == math.inf]
+        return kept + history[idx:]
     
     def get_last_24h(self) -> List[Dict]:
         """
@@ -103,18 +318,19 @@ class HealthStorage:
         Returns:
             List of entries from last 24h
         """
-        history = self.load_history()
-        cutoff = datetime.now() - timedelta(hours=24)
+        cutoff = (datetime.now() - timedelta(hours=24)).timestamp()
         
+        # Entries are appended in time order: scan backwards, stop at cutoff
         filtered = []
-        for entry in history:
-            try:
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                if entry_time >= cutoff:
-                    filtered.append(entry)
-            except (KeyError, ValueError):
+        for entry in self._iter_newest_first():
+            epoch = self._entry_epoch(entry)
+            if epoch is None:
                 continue
+            if epoch < cutoff:
+                break
+            filtered.append(entry)
         
+        filtered.reverse()
         return filtered
     
     def get_entries_between(self, start: datetime, end: datetime) -> List[Dict]:
@@ -128,18 +344,13 @@ class HealthStorage:
         Returns:
             List of entries in range
         """
-        history = self.load_history()
+        history, epochs = self._load_indexed()
         
-        filtered = []
-        for entry in history:
-            try:
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                if start <= entry_time <= end:
-                    filtered.append(entry)
-            except (KeyError, ValueError):
-                continue
+        # Entries are appended in time order: binary search both bounds
+        lo = bisect_left(epochs, start.timestamp())
+        hi = bisect_right(epochs, end.timestamp(), lo)
         
-        return filtered
+        return [entry for entry, epoch in zip(history[lo:hi], epochs[lo:hi]) if epoch != math.inf]
     
     def get_latest_entry(self) -> Optional[Dict]:
         """
@@ -148,8 +359,7 @@ class HealthStorage:
         Returns:
             Latest entry or None if empty
         """
-        history = self.load_history()
-        return history[-1] if history else None
+        return next(self._iter_newest_first(), None)
     
     def get_file_size_mb(self) -> float:
         """
@@ -159,5 +369,5 @@ class HealthStorage:
             File size in megabytes
         """
         if self.history_file.exists():
-            return self.history_file.stat().st_size / (1024 * 1024)
+            return self.history_file.stat().st_size / _MB
         return 0.0